@@ -0,0 +1,49 @@
+"""
+Test Database helpers
+
+When the suite is run in parallel with pytest-xdist:
+  pytest -n $(nproc) --dist=loadfile
+every worker gets its own database so tests don't trample each
+other's rows. PostgreSQL databases are cloned by conftest.py.
+"""
+import os
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+
+def worker_database_uri(database_uri):
+    """Returns a SQLite database URI private to the current xdist worker
+
+    The file name gets the worker as a suffix (e.g. test_gw0.db). Other
+    URIs, in-memory SQLite and runs outside of xdist are left unchanged.
+    """
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    url = make_url(database_uri)
+    if not worker or url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return database_uri
+
+    root, ext = os.path.splitext(url.database)
+    return url.set(database=f"{root}_{worker}{ext}").render_as_string(hide_password=False)
+
+
+def create_database(conn, name, template="template0"):
+    """Creates a throwaway test database from a template
+
+    Commits in it don't wait for the WAL to reach disk, durability is
+    of no use for test data. The setting isn't copied by TEMPLATE so it
+    is applied to every database created here.
+    """
+    conn.execute(text(f'CREATE DATABASE "{name}" TEMPLATE "{template}"'))
+    conn.execute(text(f'ALTER DATABASE "{name}" SET synchronous_commit = off'))
+
+
+def truncate_tables(session, *tables):
+    """Empties the given tables and resets their ids in one statement"""
+    if session.bind.dialect.name == "postgresql":
+        names = ", ".join(table.name for table in tables)
+        session.execute(text(f"TRUNCATE TABLE {names} RESTART IDENTITY CASCADE"))
+    else:
+        # SQLite has no TRUNCATE, an unqualified DELETE is its equivalent
+        for table in tables:
+            session.execute(table.delete())
+    session.commit()